@@ -31,6 +31,14 @@ class Settings:
     REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "10"))
     USER_AGENT: str = os.getenv("USER_AGENT", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
 
+    # Parsed recipe cache (set RECIPE_CACHE_TTL to 0 to disable)
+    RECIPE_CACHE_TTL: int = int(os.getenv("RECIPE_CACHE_TTL", "3600"))  # Seconds
+    RECIPE_CACHE_MAX_SIZE: int = int(os.getenv("RECIPE_CACHE_MAX_SIZE", "1024"))
+
+    # HTTP response cache for page fetches (set HTTP_CACHE_TTL to 0 to disable)
+    HTTP_CACHE_PATH: str = os.getenv("HTTP_CACHE_PATH", "/tmp/recipe_cache")  # SQLite file, ".sqlite" is appended
+    HTTP_CACHE_TTL: int = int(os.getenv("HTTP_CACHE_TTL", "3600"))  # Seconds
+
 # Create settings instance
 settings = Settings()
 
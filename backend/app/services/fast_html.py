@@ -0,0 +1,48 @@
+"""
+Fast HTML scanning for the few elements the parsers need up front
+
+Uses lxml's pull parser to pick out og:image and JSON-LD scripts without
+building a full BeautifulSoup tree for the page.
+"""
+
+from typing import List, Optional, Tuple
+from lxml import etree
+
+JSON_LD_TYPE = 'application/ld+json'
+
+
+def extract_og_and_jsonld(
+    html_bytes: bytes,
+    encoding: Optional[str] = None
+) -> Tuple[Optional[str], List[Optional[str]]]:
+    """Return the page's og:image (twitter:image as fallback) and its JSON-LD script contents
+    
+    Pass the charset declared in the HTTP headers as encoding - without it lxml
+    only sees <meta charset> and otherwise decodes the page as Latin-1
+    """
+    og_image = None
+    twitter_image = None
+    json_ld_scripts = []
+    
+    # Only <meta> and <script> end events are surfaced to Python
+    try:
+        parser = etree.HTMLPullParser(events=('end',), tag=('meta', 'script'), encoding=encoding)
+    except LookupError:
+        # Unknown declared charset - let lxml detect it from the document instead
+        parser = etree.HTMLPullParser(events=('end',), tag=('meta', 'script'))
+    parser.feed(html_bytes)
+    parser.close()
+    
+    for _, element in parser.read_events():
+        if element.tag == 'meta':
+            content = (element.get('content') or '').strip()
+            if not content:
+                continue
+            if og_image is None and element.get('property') == 'og:image':
+                og_image = content
+            elif twitter_image is None and element.get('name') == 'twitter:image':
+                twitter_image = content
+        elif element.get('type') == JSON_LD_TYPE:
+            json_ld_scripts.append(element.text)  # None for empty scripts
+    
+    return og_image or twitter_image, json_ld_scripts
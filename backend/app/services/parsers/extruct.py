@@ -1,5 +1,7 @@
+import json
 from typing import Optional, List, Dict, Any
 import extruct
+import orjson
 from app.models import Recipe
 from .base import BaseParser
 from ..processors.recipe_converter import RecipeConverter
@@ -44,6 +46,38 @@ class ExtructParser(BaseParser):
             print(f"extruct failed: {e}")
             return None
     
+    def parse_json_ld(self, json_ld_scripts: List[Optional[str]]) -> Optional[Recipe]:
+        """Build a recipe straight from JSON-LD script contents, skipping the full extruct pass
+        
+        Only returns a complete recipe - anything less is left to parse() to handle
+        """
+        try:
+            recipes = []
+            for script in json_ld_scripts:
+                if not script:
+                    continue
+                try:
+                    data = orjson.loads(script)
+                except orjson.JSONDecodeError:
+                    try:
+                        # Non-strict json tolerates raw control characters inside strings
+                        data = json.loads(script, strict=False)
+                    except json.JSONDecodeError:
+                        continue
+                recipes.extend(self._find_recipes_recursive(data))
+            
+            for recipe in RecipeConverter.iter_converted(recipes):
+                if RecipeConverter.is_complete_recipe(recipe):
+                    print(f"✅ Found complete recipe in JSON-LD: {recipe.title}")
+                    return recipe
+            
+            return None
+            
+        except Exception as e:
+            # Leave the page to extruct and AI rather than failing the whole parse
+            print(f"JSON-LD parsing failed: {e}")
+            return None
+    
     def _find_all_recipes(self, structured_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Find all recipe objects in extruct data"""
         recipes = []
@@ -97,23 +131,24 @@ class ExtructParser(BaseParser):
     def _select_best_recipe(self, recipes: List[Dict[str, Any]]) -> Optional[Recipe]:
         """Select the best recipe from candidates"""
         
-        # Try to find a complete recipe first
-        for recipe_data in recipes:
-            recipe = RecipeConverter.convert_structured_data_to_recipe(recipe_data)
+        candidates = []  # Converted so far, reused by the fallback passes below
+        
+        # Try to find a complete recipe first - converting lazily stops at the first one
+        for recipe in RecipeConverter.iter_converted(recipes):
             if RecipeConverter.is_complete_recipe(recipe):
                 print(f"✅ Found complete recipe: {recipe.title}")
                 return recipe
+            candidates.append(recipe)
         
         # If no complete recipe, return the best "good enough" one
-        for recipe_data in recipes:
-            recipe = RecipeConverter.convert_structured_data_to_recipe(recipe_data)
+        for recipe in candidates:
             if RecipeConverter.is_good_enough_recipe(recipe):
                 print(f"✅ Found good enough recipe: {recipe.title}")
                 return recipe
         
         # If nothing is good enough, return the first one anyway
-        if recipes:
-            recipe = RecipeConverter.convert_structured_data_to_recipe(recipes[0])
+        if candidates:
+            recipe = candidates[0]
             print(f"⚠️ Returning incomplete recipe: {recipe.title}")
             return recipe
         
@@ -2,22 +2,35 @@ from typing import Optional
 from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 
+# og:image and twitter:image tags gathered in a single tree walk
+META_IMAGE_SELECTOR = 'meta[property="og:image"][content], meta[name="twitter:image"][content]'
+
+# Accepted schemes and ImageObject fields for structured data images
+URL_PREFIXES = ('http://', 'https://')
+IMAGE_OBJECT_FIELDS = ('url', 'contentUrl', '@id', 'src')
+
 class ImageExtractor:
     """Handles image extraction from recipe pages"""
     
     @staticmethod
     def extract_og_image(soup: BeautifulSoup) -> Optional[str]:
         """Extract og:image - most reliable for recipe sites"""
-        og_image = soup.find('meta', property='og:image')
-        if og_image and og_image.get('content'):
-            return og_image.get('content')
+        twitter_image = None
         
-        # Fallback to twitter:image
-        twitter_image = soup.find('meta', name='twitter:image')
-        if twitter_image and twitter_image.get('content'):
-            return twitter_image.get('content')
+        for meta in soup.select(META_IMAGE_SELECTOR):
+            content = meta.get('content', '').strip()
+            if not content:
+                continue
+            
+            # og:image wins regardless of document order
+            if meta.get('property') == 'og:image':
+                return content
+            
+            # Remember the first twitter:image as fallback
+            if twitter_image is None:
+                twitter_image = content
         
-        return None
+        return twitter_image
     
     @staticmethod
     def extract_from_structured_data(image_data) -> Optional[str]:
@@ -27,7 +40,7 @@ class ImageExtractor:
         
         # Case 1: Simple URL string
         if isinstance(image_data, str):
-            return image_data if image_data.startswith('http') else None
+            return image_data if image_data.startswith(URL_PREFIXES) else None
         
         # Case 2: Array of images
         if isinstance(image_data, list):
@@ -38,9 +51,9 @@ class ImageExtractor:
         
         # Case 3: ImageObject or similar dict
         if isinstance(image_data, dict):
-            for field in ['url', 'contentUrl', '@id', 'src']:
+            for field in IMAGE_OBJECT_FIELDS:
                 url = image_data.get(field)
-                if url and isinstance(url, str) and url.startswith('http'):
+                if url and isinstance(url, str) and url.startswith(URL_PREFIXES):
                     return url
         
         return None
@@ -1,43 +1,78 @@
 import re
 from typing import List, Union
 
+# Phrases that suggest several steps were concatenated into one string
+STEP_INDICATORS = (
+    'To Prep', 'To Cook', 'To Serve', 'To Finish',
+    'Step 1', 'Step 2', 'Step 3',
+    'Heat some', 'Next', 'Then', 'When', 'After', 'Meanwhile',
+    '1.', '2.', '3.', '4.', '5.',
+    'In a', 'Add the', 'Remove from'
+)
+
+# Split patterns for concatenated instructions, compiled once at import
+SPLIT_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r'\n\n+',  # Double newlines or more
+    r'(?=To Prep\b)',
+    r'(?=To Cook\b)', 
+    r'(?=To Serve\b)',
+    r'(?=To Finish\b)',
+    r'(?=Next\b)',
+    r'(?=Then\b)',
+    r'(?=Meanwhile\b)',
+    r'(?=\d+\.)',  # Numbered steps like "1.", "2."
+    r'(?=Step \d+)',  # Step 1, Step 2, etc.
+))
+
+WHITESPACE_RE = re.compile(r'\s+')
+HTML_TAG_RE = re.compile(r'<[^>]+>')
+
 class InstructionProcessor:
     """Handles processing and splitting of recipe instructions"""
     
     @staticmethod
     def process_instructions(raw_instructions: Union[str, list]) -> List[str]:
         """Process raw instructions and return a clean list of steps"""
-        instructions = []
+        cleaned_instructions = []
         
         print(f"🔧 Processing instructions of type: {type(raw_instructions)}")
         
         if isinstance(raw_instructions, str):
             # Single concatenated string - split it intelligently
             print(f"🔧 Found concatenated string instruction, splitting...")
-            instructions = InstructionProcessor._split_concatenated_instructions(raw_instructions)
+            for step in InstructionProcessor._split_concatenated_instructions(raw_instructions):
+                step = step.strip()
+                if len(step) > 10:  # Only keep substantial instructions
+                    cleaned_instructions.append(step)
             
         elif isinstance(raw_instructions, list):
             for instr in raw_instructions:
                 if isinstance(instr, dict):
-                    text = instr.get('text', instr.get('name', str(instr)))
+                    # Only stringify the whole dict when it has neither text nor name
+                    if 'text' in instr:
+                        text = instr['text']
+                    elif 'name' in instr:
+                        text = instr['name']
+                    else:
+                        text = str(instr)
                 else:
                     text = str(instr)
                 
-                if text and len(text.strip()) > 5:
-                    # Check if this single instruction is actually concatenated
-                    if InstructionProcessor._looks_like_concatenated_steps(text):
-                        print(f"🔧 Found concatenated instruction in list, splitting...")
-                        split_steps = InstructionProcessor._split_concatenated_instructions(text)
-                        instructions.extend(split_steps)
-                    else:
-                        instructions.append(text.strip())
-        
-        # Clean up instructions
-        cleaned_instructions = []
-        for instruction in instructions:
-            instruction = instruction.strip()
-            if len(instruction) > 10:  # Only keep substantial instructions
-                cleaned_instructions.append(instruction)
+                if not text or len(text.strip()) <= 5:
+                    continue
+                
+                # Check if this single instruction is actually concatenated
+                if InstructionProcessor._looks_like_concatenated_steps(text):
+                    print(f"🔧 Found concatenated instruction in list, splitting...")
+                    steps = InstructionProcessor._split_concatenated_instructions(text)
+                else:
+                    steps = (text,)
+                
+                # Clean up and filter in the same pass
+                for step in steps:
+                    step = step.strip()
+                    if len(step) > 10:  # Only keep substantial instructions
+                        cleaned_instructions.append(step)
         
         return cleaned_instructions
     
@@ -45,15 +80,7 @@ class InstructionProcessor:
     def _looks_like_concatenated_steps(text: str) -> bool:
         """Check if text looks like multiple steps concatenated together"""
         # Look for patterns that suggest multiple steps
-        step_indicators = [
-            'To Prep', 'To Cook', 'To Serve', 'To Finish',
-            'Step 1', 'Step 2', 'Step 3',
-            'Heat some', 'Next', 'Then', 'When', 'After', 'Meanwhile',
-            '1.', '2.', '3.', '4.', '5.',
-            'In a', 'Add the', 'Remove from'
-        ]
-        
-        found_indicators = sum(1 for indicator in step_indicators if indicator in text)
+        found_indicators = sum(1 for indicator in STEP_INDICATORS if indicator in text)
         
         # If we find multiple step indicators or the text is very long, it's likely concatenated
         return found_indicators >= 2 or len(text) > 500
@@ -61,33 +88,14 @@ class InstructionProcessor:
     @staticmethod
     def _split_concatenated_instructions(text: str) -> List[str]:
         """Split concatenated instructions into separate steps"""
-        
-        # Split on common patterns
-        split_patterns = [
-            r'\n\n+',  # Double newlines or more
-            r'(?=To Prep\b)',
-            r'(?=To Cook\b)', 
-            r'(?=To Serve\b)',
-            r'(?=To Finish\b)',
-            r'(?=Next\b)',
-            r'(?=Then\b)',
-            r'(?=Meanwhile\b)',
-            r'(?=\d+\.)',  # Numbered steps like "1.", "2."
-            r'(?=Step \d+)',  # Step 1, Step 2, etc.
-        ]
-        
         instructions = [text]  # Start with the full text
         
         # Apply each split pattern
-        for pattern in split_patterns:
+        for pattern in SPLIT_PATTERNS:
             new_instructions = []
             for instruction in instructions:
-                try:
-                    parts = re.split(pattern, instruction)
-                    new_instructions.extend([part.strip() for part in parts if part.strip()])
-                except re.error:
-                    # If regex fails, keep the original
-                    new_instructions.append(instruction)
+                parts = pattern.split(instruction)
+                new_instructions.extend([part.strip() for part in parts if part.strip()])
             instructions = new_instructions
         
         # Clean up and filter
@@ -107,10 +115,10 @@ class InstructionProcessor:
             return ""
             
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
+        text = WHITESPACE_RE.sub(' ', text)
         
         # Remove HTML tags if any
-        text = re.sub(r'<[^>]+>', '', text)
+        text = HTML_TAG_RE.sub('', text)
         
         # Clean up common artifacts
         text = text.replace('&nbsp;', ' ')
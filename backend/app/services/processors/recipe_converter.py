@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator
 from app.models import Recipe
 from .image_extractor import ImageExtractor
 from .instruction_processor import InstructionProcessor
@@ -6,17 +6,39 @@ from .instruction_processor import InstructionProcessor
 class RecipeConverter:
     """Handles conversion of various data formats to Recipe objects"""
     
+    # Titles that mean no real recipe was extracted
+    PLACEHOLDER_TITLES = frozenset({"Untitled Recipe", "Could not parse recipe"})
+    
     @staticmethod
-    def convert_structured_data_to_recipe(recipe_data: Dict[str, Any]) -> Recipe:
+    def convert_structured_data_to_recipe(
+        recipe_data: Dict[str, Any],
+        *,
+        image_extractor=ImageExtractor,  # Injectable so callers (e.g. tests) can swap them
+        instruction_processor=InstructionProcessor
+    ) -> Recipe:
         """Convert structured data (JSON-LD or microdata) to Recipe object"""
-        
         # Handle microdata format vs JSON-LD format
         if 'properties' in recipe_data and 'type' in recipe_data:
-            print("Converting microdata format")
-            data = recipe_data['properties']
+            convert = RecipeConverter._convert_microdata
         else:
-            print("Converting JSON-LD format")
-            data = recipe_data
+            convert = RecipeConverter._convert_jsonld
+        return convert(recipe_data, image_extractor, instruction_processor)
+    
+    @staticmethod
+    def _convert_microdata(recipe_data: Dict[str, Any], image_extractor, instruction_processor) -> Recipe:
+        """Convert a microdata item - its schema.org fields live under 'properties'"""
+        print("Converting microdata format")
+        return RecipeConverter._build_recipe(recipe_data['properties'], image_extractor, instruction_processor)
+    
+    @staticmethod
+    def _convert_jsonld(recipe_data: Dict[str, Any], image_extractor, instruction_processor) -> Recipe:
+        """Convert a JSON-LD Recipe object - its schema.org fields are top level"""
+        print("Converting JSON-LD format")
+        return RecipeConverter._build_recipe(recipe_data, image_extractor, instruction_processor)
+    
+    @staticmethod
+    def _build_recipe(data: Dict[str, Any], image_extractor, instruction_processor) -> Recipe:
+        """Map schema.org Recipe fields onto a Recipe object"""
         
         # Extract basic fields with array handling
         title = RecipeConverter._get_value(data, 'name') or 'Untitled Recipe'
@@ -33,10 +55,10 @@ class RecipeConverter:
         
         # Extract and process instructions
         raw_instructions = data.get('recipeInstructions', [])
-        instructions = InstructionProcessor.process_instructions(raw_instructions)
+        instructions = instruction_processor.process_instructions(raw_instructions)
         
         # Extract image
-        image = ImageExtractor.extract_from_structured_data(data.get('image'))
+        image = image_extractor.extract_from_structured_data(data.get('image'))
         
         # Extract timing and serving info
         prep_time = RecipeConverter._get_value(data, 'prepTime')
@@ -69,6 +91,15 @@ class RecipeConverter:
             used_ai=False
         )
     
+    @staticmethod
+    def iter_converted(recipes_data: List[Dict[str, Any]]) -> Iterator[Recipe]:
+        """Lazily convert structured data recipes, skipping any that fail to convert"""
+        for recipe_data in recipes_data:
+            try:
+                yield RecipeConverter.convert_structured_data_to_recipe(recipe_data)
+            except Exception as e:
+                print(f"⚠️ Skipping recipe that failed to convert: {e}")
+    
     @staticmethod
     def _extract_source(data: Dict[str, Any]) -> Optional[str]:
         """Extract source organization from structured data"""
@@ -128,8 +159,8 @@ class RecipeConverter:
     def _get_value(data: Dict[str, Any], field_name: str) -> Optional[str]:
         """Extract value from data, handling arrays"""
         value = data.get(field_name)
-        if isinstance(value, list) and value:
-            return value[0]
+        if isinstance(value, list):
+            return value[0] if value else None
         return value
     
     @staticmethod
@@ -137,14 +168,19 @@ class RecipeConverter:
         """Clean up ingredients list"""
         cleaned = []
         for ing in ingredients:
+            if ing is None:
+                continue  # Real-world schema.org data sometimes has null entries
+            
             if isinstance(ing, dict):
                 # Sometimes ingredients are objects with 'name' or 'text' fields
                 ing_text = ing.get('name', ing.get('text', str(ing)))
             else:
                 ing_text = str(ing)
             
-            if ing_text and len(ing_text.strip()) > 1:
-                cleaned.append(ing_text.strip())
+            # Strip once and reuse the result for both the check and the output
+            ing_text = ing_text.strip() if ing_text else ''
+            if len(ing_text) > 1:
+                cleaned.append(ing_text)
         
         return cleaned
     
@@ -166,7 +202,7 @@ class RecipeConverter:
         """Check if recipe has enough data to be considered complete"""
         return (
             recipe and
-            recipe.title not in ["Untitled Recipe", "Could not parse recipe"] and
+            recipe.title not in RecipeConverter.PLACEHOLDER_TITLES and
             len(recipe.ingredients) >= 3 and
             len(recipe.instructions) >= 1
         )
@@ -176,6 +212,6 @@ class RecipeConverter:
         """Check if recipe has some useful data, even if not complete"""
         return (
             recipe and
-            recipe.title not in ["Untitled Recipe", "Could not parse recipe"] and
+            recipe.title not in RecipeConverter.PLACEHOLDER_TITLES and
             (len(recipe.ingredients) >= 2 or len(recipe.instructions) >= 1)
         )
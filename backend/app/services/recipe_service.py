@@ -1,20 +1,104 @@
+import asyncio
+import time
+from functools import lru_cache
 import requests
+import requests_cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from fastapi import HTTPException
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
 
 from app.config import settings
 from app.models import Recipe, DebugInfo
+from app.utils.helpers import HTML_PARSER
 from .parsers import RecipeScrapersParser, ExtructParser, parse_with_ai
 from .processors import ImageExtractor, RecipeConverter
+from .fast_html import extract_og_and_jsonld, JSON_LD_TYPE
 from .ingredient_parser import parse_ingredients_list, get_raw_ingredients_for_search, get_shopping_list_items
 
+def _build_session() -> requests.Session:
+    """Build the shared HTTP session used for page fetches"""
+    if settings.HTTP_CACHE_TTL > 0:
+        # Cache pages on disk and revalidate with ETag/Last-Modified so repeat fetches can be served by a 304
+        session = requests_cache.CachedSession(
+            cache_name=settings.HTTP_CACHE_PATH,
+            backend='sqlite',
+            expire_after=settings.HTTP_CACHE_TTL,
+            allowable_methods=('GET',),
+            cache_control=True,
+            stale_if_error=True
+        )
+    else:
+        session = requests.Session()
+    
+    # Retry transient gateway errors; let raise_for_status() report the final response
+    retries = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[502, 503, 504],
+        allowed_methods=['GET'],
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=64, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+# Reused across requests so repeat fetches skip DNS and TCP/TLS handshakes
+_SESSION = _build_session()
+
+# Display names for common recipe sites
+KNOWN_SOURCES = {
+    'loveandlemons.com': 'Love and Lemons',
+    'asianinspirations.com.au': 'Asian Inspirations',
+    'allrecipes.com': 'Allrecipes',
+    'foodnetwork.com': 'Food Network',
+    'tasteofhome.com': 'Taste of Home',
+    'epicurious.com': 'Epicurious',
+    'simplyrecipes.com': 'Simply Recipes',
+    'seriouseats.com': 'Serious Eats',
+    'buzzfeed.com': 'BuzzFeed',
+    'delish.com': 'Delish',
+    'foodandwine.com': 'Food & Wine',
+    'bonappetit.com': 'Bon Appétit',
+}
+
+# Parsed recipes keyed by normalized URL -> (expires_at, recipe)
+_RECIPE_CACHE: Dict[str, Tuple[float, Recipe]] = {}
+
+# Parses currently running, keyed by normalized URL, so concurrent callers share one
+_INFLIGHT: Dict[str, asyncio.Task] = {}
+
+def _normalize_url(url: str) -> str:
+    """Normalize a URL so trivially different spellings share a cache entry"""
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', query, ''))
+
+# Placeholder returned when no parser succeeds; validated once and copied per request
+_FALLBACK_RECIPE = Recipe(
+    title="Unable to parse recipe",
+    description="Could not extract recipe data using any method",
+    ingredients=["Could not extract ingredients"],
+    instructions=["Could not extract instructions"],
+    raw_ingredients=[],
+    raw_ingredients_detailed=[],
+    found_structured_data=False,
+    used_ai=False
+)
+
+# Parsers are stateless, so one shared instance serves every request
+_RS_PARSER = RecipeScrapersParser()
+_EX_PARSER = ExtructParser()
+
 class RecipeService:
     """Main recipe parsing service - orchestrates different parsing strategies"""
     
     def __init__(self):
-        self.recipe_scrapers_parser = RecipeScrapersParser()
-        self.extruct_parser = ExtructParser()
+        self.recipe_scrapers_parser = _RS_PARSER
+        self.extruct_parser = _EX_PARSER
 
     def _add_raw_ingredients(self, recipe: Recipe) -> Recipe:
         """Add structured raw ingredients to a recipe"""
@@ -48,8 +132,55 @@ class RecipeService:
         
         return recipe   
     
+    async def _aadd_raw_ingredients(self, recipe: Recipe) -> Recipe:
+        """Add structured raw ingredients without blocking the event loop"""
+        # Ingredient NLP is CPU-bound, so run it in a worker thread
+        return await asyncio.to_thread(self._add_raw_ingredients, recipe)
+    
     @staticmethod
     async def parse_recipe_hybrid(url: str) -> Recipe:
+        """Parse recipe from URL, serving recently parsed URLs from cache"""
+        cache_key = _normalize_url(url)
+        
+        cached = _RECIPE_CACHE.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            print(f"♻️ Cache hit for {url}")
+            return cached[1].model_copy(deep=True)  # Callers may mutate the result
+        
+        task = _INFLIGHT.get(cache_key)
+        if task is None:
+            task = asyncio.ensure_future(RecipeService._parse_and_cache(url, cache_key))
+            _INFLIGHT[cache_key] = task
+            task.add_done_callback(lambda _: _INFLIGHT.pop(cache_key, None))
+        else:
+            print(f"⏳ Joining in-flight parse for {url}")
+        
+        # Shield so one caller cancelling doesn't cancel the parse for the others
+        recipe = await asyncio.shield(task)
+        return recipe.model_copy(deep=True)
+    
+    @staticmethod
+    async def _parse_and_cache(url: str, cache_key: str) -> Recipe:
+        """Parse a URL and store the result in the recipe cache"""
+        recipe = await RecipeService._parse_recipe_uncached(url)
+        
+        # Only cache real results so failed pages get retried
+        if settings.RECIPE_CACHE_TTL > 0 and recipe.title != "Unable to parse recipe":
+            _RECIPE_CACHE.pop(cache_key, None)
+            if len(_RECIPE_CACHE) >= settings.RECIPE_CACHE_MAX_SIZE:
+                _RECIPE_CACHE.pop(next(iter(_RECIPE_CACHE)))  # Evict the oldest entry
+            expires_at = time.monotonic() + settings.RECIPE_CACHE_TTL
+            _RECIPE_CACHE[cache_key] = (expires_at, recipe.model_copy(deep=True))
+        
+        return recipe
+    
+    @staticmethod
+    def clear_cache() -> None:
+        """Drop all cached parse results"""
+        _RECIPE_CACHE.clear()
+    
+    @staticmethod
+    async def _parse_recipe_uncached(url: str) -> Recipe:
         """Parse recipe using multiple strategies with image-focused approach"""
         service = RecipeService()
         
@@ -57,25 +188,37 @@ class RecipeService:
             print(f"🔍 Parsing {url} with modular approach...")
             
             # Fetch page once and extract og:image immediately
-            response, soup = service._fetch_page(url)
-            og_image = ImageExtractor.extract_og_image(soup)
+            # (blocking work runs in a worker thread so the event loop stays free)
+            response = await asyncio.to_thread(service._fetch_response, url)
+            og_image, json_ld_scripts = await asyncio.to_thread(
+                extract_og_and_jsonld, response.content, service._declared_encoding(response)
+            )
             print(f"🖼️ og:image found: {og_image}")
             
             # STEP 1: Try recipe-scrapers
             print("🔍 Step 1: Trying recipe-scrapers...")
-            recipe = service.recipe_scrapers_parser.parse(url)
+            recipe = await asyncio.to_thread(service.recipe_scrapers_parser.parse, url)
             if recipe and RecipeConverter.is_complete_recipe(recipe):
                 recipe = service._ensure_image_and_source(recipe, og_image, url)
-                recipe = service._add_raw_ingredients(recipe)
+                recipe = await service._aadd_raw_ingredients(recipe)
                 print("✅ recipe-scrapers successful!")
                 return recipe
             
-            # STEP 2: Try extruct
-            print("🔍 Step 2: Trying extruct...")
-            recipe = service.extruct_parser.parse(url, html_content=response.text)
+            # STEP 2: Try the page's JSON-LD directly - most recipe sites only need this
+            print("🔍 Step 2: Trying JSON-LD...")
+            recipe = await asyncio.to_thread(service.extruct_parser.parse_json_ld, json_ld_scripts)
+            if recipe:
+                recipe = service._ensure_image_and_source(recipe, og_image, url)
+                recipe = await service._aadd_raw_ingredients(recipe)
+                print("✅ JSON-LD successful!")
+                return recipe
+            
+            # STEP 3: Try extruct (microdata and RDFa as well as JSON-LD)
+            print("🔍 Step 3: Trying extruct...")
+            recipe = await asyncio.to_thread(service.extruct_parser.parse, url, html_content=response.text)
             if recipe:
                 recipe = service._ensure_image_and_source(recipe, og_image, url)
-                recipe = service._add_raw_ingredients(recipe)
+                recipe = await service._aadd_raw_ingredients(recipe)
                 if RecipeConverter.is_complete_recipe(recipe):
                     print("✅ extruct successful!")
                     return recipe
@@ -86,12 +229,13 @@ class RecipeService:
                     print("⚠️ extruct data poor quality, trying AI...")
                     extruct_recipe = recipe  # Save for potential return later
             
-            # STEP 3: AI fallback
-            print("🔍 Step 3: Using AI...")
+            # STEP 4: AI fallback
+            print("🔍 Step 4: Using AI...")
+            soup = await asyncio.to_thread(service._build_soup, response)  # Only the AI step needs a full tree
             ai_recipe = await parse_with_ai(soup, url)
             if ai_recipe:
                 ai_recipe = service._ensure_image_and_source(ai_recipe, og_image, url)
-                ai_recipe = service._add_raw_ingredients(ai_recipe)
+                ai_recipe = await service._aadd_raw_ingredients(ai_recipe)
                 if RecipeConverter.is_complete_recipe(ai_recipe):
                     print("✅ AI successful!")
                     return ai_recipe
@@ -103,36 +247,73 @@ class RecipeService:
             best_recipe = recipe or ai_recipe
             if best_recipe:
                 best_recipe = service._ensure_image_and_source(best_recipe, og_image, url)
-                best_recipe = service._add_raw_ingredients(best_recipe)
+                best_recipe = await service._aadd_raw_ingredients(best_recipe)
                 print(f"📝 Returning best partial result: {best_recipe.title}")
                 return best_recipe
             
             # Last resort - return failure with image and source
-            fallback_source = service._extract_source_from_url(url)
-            return Recipe(
-                title="Unable to parse recipe",
-                description="Could not extract recipe data using any method",
-                image=og_image,  # At least return the image
-                source=fallback_source,  # At least return the source
-                ingredients=["Could not extract ingredients"],
-                instructions=["Could not extract instructions"],
-                raw_ingredients=[],
-                raw_ingredients_detailed=[],
-                found_structured_data=False,
-                used_ai=False
-            )
+            return service._build_fallback_recipe(url, og_image)
                 
         except Exception as e:
             print(f"Error: {e}")
             raise HTTPException(status_code=500, detail=f"Parsing error: {str(e)}")
     
+    @staticmethod
+    async def parse_many(urls: List[str], concurrency: int = 10) -> List[Recipe]:
+        """Parse several recipe URLs concurrently, returning results in input order"""
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def _bounded(url: str) -> Recipe:
+            async with semaphore:
+                return await RecipeService.parse_recipe_hybrid(url)
+        
+        results = await asyncio.gather(*(_bounded(url) for url in urls), return_exceptions=True)
+        
+        # One failing URL shouldn't sink the whole batch
+        service = RecipeService()
+        recipes = []
+        for url, result in zip(urls, results):
+            if isinstance(result, BaseException):  # CancelledError isn't an Exception subclass
+                print(f"⚠️ Failed to parse {url}: {result}")
+                recipes.append(service._build_fallback_recipe(url))
+            else:
+                recipes.append(result)
+        return recipes
+    
+    def _build_fallback_recipe(self, url: str, og_image: Optional[str] = None) -> Recipe:
+        """Build the placeholder recipe returned when no parser succeeds"""
+        return _FALLBACK_RECIPE.model_copy(
+            update={
+                "image": og_image,  # At least return the image
+                "source": self._extract_source_from_url(url)  # At least return the source
+            },
+            deep=True  # Don't share the template's lists with callers
+        )
+    
     def _fetch_page(self, url: str):
         """Fetch webpage content"""
+        response = self._fetch_response(url)
+        return response, self._build_soup(response)
+    
+    def _fetch_response(self, url: str) -> requests.Response:
+        """Fetch the raw webpage response"""
         headers = {'User-Agent': settings.USER_AGENT}
-        response = requests.get(url, headers=headers, timeout=settings.REQUEST_TIMEOUT)
+        response = _SESSION.get(url, headers=headers, timeout=settings.REQUEST_TIMEOUT)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        return response, soup
+        return response
+    
+    @staticmethod
+    def _build_soup(response: requests.Response) -> BeautifulSoup:
+        """Parse a fetched page into a BeautifulSoup tree"""
+        # Skip BeautifulSoup's encoding detection when the server declared a charset
+        from_encoding = RecipeService._declared_encoding(response)
+        return BeautifulSoup(response.content, HTML_PARSER, from_encoding=from_encoding)
+    
+    @staticmethod
+    def _declared_encoding(response: requests.Response) -> Optional[str]:
+        """Return the charset from the Content-Type header, or None if the server didn't declare one"""
+        charset_declared = 'charset=' in response.headers.get('Content-Type', '').lower()
+        return response.encoding if charset_declared else None
     
     def _ensure_image_and_source(self, recipe: Recipe, fallback_image: Optional[str], url: str) -> Recipe:
         """Ensure recipe has an image and source, using fallbacks if needed"""
@@ -149,35 +330,19 @@ class RecipeService:
         
         return recipe
     
-    def _extract_source_from_url(self, url: str) -> Optional[str]:
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def _extract_source_from_url(url: str) -> Optional[str]:
         """Extract source name from URL as fallback"""
         try:
-            from urllib.parse import urlparse
-            parsed_url = urlparse(url)
-            domain = parsed_url.netloc.lower()
+            domain = urlsplit(url).netloc.lower()
             
             # Remove www. prefix
             if domain.startswith('www.'):
                 domain = domain[4:]
             
-            # Manual mapping for common recipe sites
-            domain_mapping = {
-                'loveandlemons.com': 'Love and Lemons',
-                'asianinspirations.com.au': 'Asian Inspirations',
-                'allrecipes.com': 'Allrecipes',
-                'foodnetwork.com': 'Food Network',
-                'tasteofhome.com': 'Taste of Home',
-                'epicurious.com': 'Epicurious',
-                'simplyrecipes.com': 'Simply Recipes',
-                'seriouseats.com': 'Serious Eats',
-                'buzzfeed.com': 'BuzzFeed',
-                'delish.com': 'Delish',
-                'foodandwine.com': 'Food & Wine',
-                'bonappetit.com': 'Bon Appétit',
-            }
-            
-            if domain in domain_mapping:
-                return domain_mapping[domain]
+            if domain in KNOWN_SOURCES:
+                return KNOWN_SOURCES[domain]
             
             # Generic conversion: remove .com/.org/etc and make readable
             domain_parts = domain.split('.')
@@ -193,21 +358,26 @@ class RecipeService:
         return None
     
     @staticmethod
-    def debug_recipe(url: str) -> DebugInfo:
+    def debug_recipe(url: str, use_bs4: bool = False) -> DebugInfo:
         """Debug endpoint with image info"""
         try:
             service = RecipeService()
-            response, soup = service._fetch_page(url)
-            og_image = ImageExtractor.extract_og_image(soup)
+            if use_bs4:
+                response, soup = service._fetch_page(url)
+                og_image = ImageExtractor.extract_og_image(soup)
+                json_scripts = [script.string for script in soup.find_all('script', type=JSON_LD_TYPE)]
+            else:
+                # Only og:image and JSON-LD are needed, so skip building a BeautifulSoup tree
+                response = service._fetch_response(url)
+                og_image, json_scripts = extract_og_and_jsonld(response.content, service._declared_encoding(response))
             
-            json_scripts = soup.find_all('script', type='application/ld+json')
             json_scripts_content = []
             
             for i, script in enumerate(json_scripts):
                 script_info = {
                     "script_number": i + 1,
-                    "has_content": script.string is not None,
-                    "content_preview": script.string[:200] if script.string else None
+                    "has_content": script is not None,
+                    "content_preview": script[:200] if script else None
                 }
                 if i == 0:  # Add image info to first script
                     script_info["og_image_found"] = og_image
@@ -1,6 +1,9 @@
 from bs4 import BeautifulSoup
 from app.models import Recipe
 
+# lxml is a hard dependency - its C parser is much faster than the pure-Python html.parser
+HTML_PARSER = 'lxml'
+
 def extract_main_content(soup: BeautifulSoup) -> str:
     """Extract the main content area for AI parsing, removing navigation, ads, etc."""
     
@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
@@ -8,7 +9,8 @@ from app.routes import health, recipes
 app = FastAPI(
     title="Recipe Parser API", 
     version="1.0.0",
-    description="An AI-powered recipe parser that extracts structured data from recipe URLs"
+    description="An AI-powered recipe parser that extracts structured data from recipe URLs",
+    default_response_class=ORJSONResponse  # orjson encodes JSON responses much faster than stdlib json
 )
 
 # Add CORS middleware to allow frontend requests